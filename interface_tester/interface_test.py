@@ -3,15 +3,17 @@
 import dataclasses
 import inspect
 import logging
-import operator
 import re
+import sys
 import typing
 from contextlib import contextmanager
+from contextvars import ContextVar
 from enum import Enum
-from typing import Any, Callable, List, Literal, Optional, Union
+from functools import lru_cache
+from typing import Any, Callable, List, Literal, Optional, Tuple, Type, Union
 
 from ops.testing import CharmType
-from pydantic import ValidationError
+from pydantic import TypeAdapter, ValidationError
 from scenario import Context, Event, Relation, State
 
 from interface_tester.errors import InvalidTestCaseError, SchemaValidationError
@@ -28,6 +30,8 @@ INTF_NAME_AND_VERSION_REGEX = re.compile(r"/interfaces/(\w+)/v(\d+)/")
 
 logger = logging.getLogger(__name__)
 
+_EMPTY_STATE = State()
+
 
 class InvalidTestCase(RuntimeError):
     """Raised if a function decorated with interface_test_case is invalid."""
@@ -38,7 +42,11 @@ class Role(str, Enum):
     requirer = "requirer"
 
 
-@dataclasses.dataclass
+# slotted dataclasses are only available from python 3.10 onwards
+_DATACLASS_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+
+@dataclasses.dataclass(**_DATACLASS_SLOTS)
 class _InterfaceTestContext:
     """Data associated with a single interface test case."""
 
@@ -72,6 +80,28 @@ class _InterfaceTestContext:
     juju_version: Optional[str] = None
     """The juju version Scenario will simulate. Defaults to whatever Scenario's default is."""
 
+    _warned_template_conflict: bool = dataclasses.field(default=False, init=False, repr=False)
+    """Whether we already warned that the state template contains the tested relation."""
+    _resolved_endpoint: Optional[str] = dataclasses.field(default=None, init=False, repr=False)
+    """The endpoint to generate the tested relation on, if none is provided by the test."""
+    _endpoint_error: Optional[str] = dataclasses.field(default=None, init=False, repr=False)
+    """Error message, set instead of ``_resolved_endpoint`` if there is no single endpoint."""
+
+    def __post_init__(self):
+        # supported_endpoints and role are fixed for this context: resolve the endpoint once.
+        endpoints_for_interface = self.supported_endpoints.get(self.role, ())
+
+        if len(endpoints_for_interface) < 1:
+            self._endpoint_error = f"no endpoint found for {self.role}/{self.interface_name}."
+        elif len(endpoints_for_interface) > 1:
+            self._endpoint_error = (
+                f"Multiple endpoints found for {self.role}/{self.interface_name}: "
+                f"{endpoints_for_interface}: cannot guess which one it is "
+                f"we're supposed to be testing"
+            )
+        else:
+            self._resolved_endpoint = endpoints_for_interface[0]
+
 
 def check_test_case_validator_signature(fn: Callable):
     """Verify the signature of a test case validator function.
@@ -83,15 +113,19 @@ def check_test_case_validator_signature(fn: Callable):
     Will pop a warning if the one argument is annotated with anything other than scenario.State
     (or no annotation).
     """
+    # inspect.signature is expensive: only inspect each validator once.
+    if getattr(fn, "__itester_sig_checked__", False):
+        return
+
     sig = inspect.signature(fn)
-    if not len(sig.parameters) == 1:
+    params_iter = iter(sig.parameters.values())
+    par0 = next(params_iter, None)
+    if par0 is None or next(params_iter, None) is not None:
         raise InvalidTestCase(
             "interface test case validator expects exactly one "
             "positional argument of type State."
         )
 
-    params = list(sig.parameters.values())
-    par0 = params[0]
     if par0.kind not in (par0.POSITIONAL_OR_KEYWORD, par0.POSITIONAL_ONLY):
         raise InvalidTestCase(
             "interface test case validator expects the first argument to be positional."
@@ -103,39 +137,93 @@ def check_test_case_validator_signature(fn: Callable):
             "only positional argument."
         )
 
+    try:
+        fn.__itester_sig_checked__ = True
+    except AttributeError:
+        # some callables (e.g. bound methods) don't accept new attributes
+        pass
+
 
-_TESTER_CTX: Optional[_InterfaceTestContext] = None
+@lru_cache(maxsize=128)
+def _make_event_builder(event_name: str) -> Callable[[Relation], Event]:
+    """Build a factory producing the Event called ``event_name`` for the tested Relation.
+
+    Cached, so that each event name is only parsed once.
+    """
+    ep_name, _, evt_kind = event_name.rpartition("-relation-")
+    if not (ep_name and evt_kind):
+        return lambda relation: Event(event_name)
+
+    # this is a relation event.
+    # we inject the relation metadata
+    # todo: if the user passes a relation event that is NOT about the relation
+    #  interface that this test is about, at this point we are injecting the wrong
+    #  Relation instance.
+    #  e.g. if in interfaces/foo one wants to test that if 'bar-relation-joined' is
+    #  fired... then one would have to pass an Event instance already with its
+    #  own Relation.
+    return lambda relation: Event(event_name, relation=relation.replace(endpoint=ep_name))
+
+
+@lru_cache(maxsize=None)
+def _databags_adapter(schema: Type["DataBagSchema"]) -> TypeAdapter:
+    """Build a validator for a list of databags against ``schema``.
+
+    Cached, so that each schema's validator is only compiled once.
+    """
+    return TypeAdapter(List[schema])
+
+
+@lru_cache(maxsize=None)
+def _accepts_empty_databags(schema: Type["DataBagSchema"]) -> bool:
+    """Whether ``schema`` is satisfied by empty unit and app databags."""
+    try:
+        schema.model_validate({"unit": {}, "app": {}})
+    except ValidationError:
+        return False
+    return True
+
+
+# the context of the interface test currently running, and the Tester bound to it (if any).
+_CTX_VAR: ContextVar[Optional[Tuple[_InterfaceTestContext, Optional["Tester"]]]] = ContextVar(
+    "_tester_ctx", default=None
+)
+
+
+def _bound_tester() -> Optional["Tester"]:
+    """The Tester instance bound to the current interface test context, if any."""
+    current = _CTX_VAR.get()
+    return current[1] if current else None
 
 
 @contextmanager
 def tester_context(ctx: _InterfaceTestContext):
-    global _TESTER_CTX
-    _TESTER_CTX = ctx
+    token = _CTX_VAR.set((ctx, None))
 
     try:
-        yield
-    except Exception:
-        tester = Tester.__instance__
+        try:
+            yield
+        except Exception:
+            tester = _bound_tester()
 
-        if tester:
-            tester._detach()
+            if tester:
+                tester._detach()
+            raise
 
-        _TESTER_CTX = None
-        raise
+        tester = _bound_tester()
 
-    tester = Tester.__instance__
+        if not tester:
+            raise NoTesterInstanceError(f"Invalid test: {ctx.test_fn} did not instantiate Tester.")
 
-    if not tester:
-        raise NoTesterInstanceError(f"Invalid test: {ctx.test_fn} did not instantiate Tester.")
+        try:
+            tester._finalize()
+        finally:
+            tester._detach()
 
-    try:
-        tester._finalize()
+        if _bound_tester():
+            raise RuntimeError("cleanup failed, tester instance still bound")
     finally:
-        tester._detach()
-        _TESTER_CTX = None
-
-    if Tester.__instance__:
-        raise RuntimeError("cleanup failed, tester instance still bound")
+        _CTX_VAR.reset(token)
 
 
 class InvalidTesterRunError(RuntimeError):
@@ -155,7 +243,14 @@ class NoSchemaError(InvalidTesterRunError):
 
 
 class Tester:
-    __instance__ = None
+    __slots__ = (
+        "_state_in",
+        "_test_name",
+        "_test_id",
+        "_state_out",
+        "_has_run",
+        "_has_checked_schema",
+    )
 
     def __init__(self, state_in: Optional[State] = None, name: Optional[str] = None):
         """Core interface test specification tool.
@@ -203,26 +298,24 @@ class Tester:
         :param name: the name of the test. Will default to the function's
             identifier (``__name__``).
         """
-        # todo: pythonify
-        if Tester.__instance__:
-            raise RuntimeError("Tester is a singleton.")
-        Tester.__instance__ = self
-
-        if not self.ctx:
+        current = _CTX_VAR.get()
+        if not current:
             raise RuntimeError("Tester can only be initialized inside an interface test context.")
 
+        ctx, tester = current
+        if tester:
+            raise RuntimeError("Tester is a singleton.")
+        _CTX_VAR.set((ctx, self))
+
         self._state_in = state_in or State()
-        self._test_name = name or self.ctx.test_fn.__name__
+        self._test_name = name or ctx.test_fn.__name__
+        # a name for this test, as descriptive and unique as possible.
+        self._test_id = f"{ctx.interface_name}[{ctx.version}]/{ctx.role}:{self._test_name}"
 
         self._state_out = None  # will be State when has_run is true
         self._has_run = False
         self._has_checked_schema = False
 
-    @property
-    def _test_id(self) -> str:
-        """A name for this test, as descriptive and unique as possible."""
-        return f"{self.ctx.interface_name}[{self.ctx.version}]/{self.ctx.role}:{self._test_name}"
-
     @property
     def ctx(self) -> Optional[_InterfaceTestContext]:
         """The test context, defined by the test caller.
@@ -233,7 +326,8 @@ class Tester:
         When called from an interface test scope, is guaranteed(^tm) to return
         ``_InterfaceTestContext``.
         """
-        return _TESTER_CTX
+        current = _CTX_VAR.get()
+        return current[0] if current else None
 
     def run(self, event: Union[str, Event]) -> State:
         """Simulate the emission on an event in the initial state you passed to the initializer.
@@ -245,7 +339,7 @@ class Tester:
         write assertions against it.
         """
         if not self.ctx:
-            raise InvalidTesterRunError("tester cannot run: no _TESTER_CTX set")
+            raise InvalidTesterRunError(self._test_id, "tester cannot run: no test context set")
 
         state_out = self._run(event)
         self._state_out = state_out
@@ -280,19 +374,32 @@ class Tester:
                     "call Tester.skip_schema_validation() instead.",
                 )
 
-        errors = []
-        for relation in self._relations:
-            try:
-                databag_schema.model_validate(
-                    {
-                        "unit": relation.local_unit_data,
-                        "app": relation.local_app_data,
-                    }
-                )
-            except ValidationError as e:
-                errors.append(e.errors()[0])
-        if errors:
-            raise SchemaValidationError(errors)
+        # the schema may be passed as a class or as an instance
+        if not isinstance(databag_schema, type):
+            databag_schema = type(databag_schema)
+
+        relations = self._relations
+        all_empty = all(not r.local_unit_data and not r.local_app_data for r in relations)
+        if all_empty and _accepts_empty_databags(databag_schema):
+            logger.debug("all databags are empty and the schema allows it: skipping validation")
+            return
+
+        databags = [
+            {
+                "unit": relation.local_unit_data,
+                "app": relation.local_app_data,
+            }
+            for relation in relations
+        ]
+        try:
+            _databags_adapter(databag_schema).validate_python(databags)
+        except ValidationError as e:
+            # report the first error for each invalid relation, located relative to its databag
+            errors = {}
+            for error in e.errors():
+                relation_idx, *loc = error["loc"]
+                errors.setdefault(relation_idx, {**error, "loc": tuple(loc)})
+            raise SchemaValidationError(list(errors.values()))
 
     def _check_has_run(self):
         if not self._has_run:
@@ -339,10 +446,13 @@ class Tester:
 
     def _detach(self):
         # release singleton
-        Tester.__instance__ = None
+        current = _CTX_VAR.get()
+        if current:
+            _CTX_VAR.set((current[0], None))
 
     def _run(self, event: Union[str, Event]):
-        logger.debug("running %s" % event)
+        ctx = self.ctx
+        logger.debug("running %s", event)
         self._has_run = True
 
         # this is the input state as specified by the interface tests writer. It can
@@ -355,63 +465,46 @@ class Tester:
         # some required config, a "happy" status, network information, OTHER relations.
         # Typically, should NOT touch the relation that this interface test is about
         #  -> so we overwrite and warn on conflict: state_template is the baseline,
-        state = (self.ctx.state_template or State()).copy()
+        base_state = ctx.state_template or _EMPTY_STATE
 
-        relations = self._generate_relations_state(
-            state, input_state, self.ctx.supported_endpoints, self.ctx.role
-        )
-        # State is frozen; replace
-        modified_state = state.replace(relations=relations)
+        # relation: the Relation instance this test is about
+        relations, relation = self._generate_relations_state(base_state, input_state, ctx.role)
+        # State is frozen; replace. No need to deep-copy first: scenario copies the
+        # input state before running and never mutates it.
+        modified_state = dataclasses.replace(base_state, relations=relations)
 
-        # the Relation instance this test is about:
-        relation = next(filter(lambda r: r.interface == self.ctx.interface_name, relations))
         # test.EVENT might be a string or an Event. Cast to Event.
         evt: Event = self._coerce_event(event, relation)
 
-        logger.info("collected test for %s with %s" % (self.ctx.interface_name, evt.name))
+        logger.info("collected test for %s with %s", ctx.interface_name, evt.name)
         return self._run_scenario(evt, modified_state)
 
     def _run_scenario(self, event: Event, state: State):
-        logger.debug("running scenario with state=%s, event=%s" % (state, event))
+        logger.debug("running scenario with state=%s, event=%s", state, event)
 
+        ctx = self.ctx
         kwargs = {}
-        if self.ctx.juju_version:
-            kwargs["juju_version"] = self.ctx.juju_version
-
-        ctx = Context(
-            self.ctx.charm_type,
-            meta=self.ctx.meta,
-            actions=self.ctx.actions,
-            config=self.ctx.config,
+        if ctx.juju_version:
+            kwargs["juju_version"] = ctx.juju_version
+
+        context = Context(
+            ctx.charm_type,
+            meta=ctx.meta,
+            actions=ctx.actions,
+            config=ctx.config,
             **kwargs,
         )
-        return ctx.run(event, state)
+        return context.run(event, state)
 
     def _coerce_event(self, raw_event: Union[str, Event], relation: Relation) -> Event:
         # if the event being tested is a relation event, we need to inject some metadata
         # or scenario.Runtime won't be able to guess what envvars need setting before ops.main
         # takes over
         if isinstance(raw_event, str):
-            ep_name, _, evt_kind = raw_event.rpartition("-relation-")
-            if ep_name and evt_kind:
-                # this is a relation event.
-                # we inject the relation metadata
-                # todo: if the user passes a relation event that is NOT about the relation
-                #  interface that this test is about, at this point we are injecting the wrong
-                #  Relation instance.
-                #  e.g. if in interfaces/foo one wants to test that if 'bar-relation-joined' is
-                #  fired... then one would have to pass an Event instance already with its
-                #  own Relation.
-                return Event(
-                    raw_event,
-                    relation=relation.replace(endpoint=ep_name),
-                )
-
-            else:
-                return Event(raw_event)
+            return _make_event_builder(raw_event)(relation)
 
         elif isinstance(raw_event, Event):
-            if raw_event._is_relation_event and not raw_event.relation:
+            if not raw_event.relation and raw_event._is_relation_event:
                 raise InvalidTestCaseError(
                     "This test case was passed an Event representing a relation event."
                     "However it does not have a Relation. Please pass it to the Event like so: "
@@ -427,68 +520,80 @@ class Tester:
             )
 
     def _generate_relations_state(
-        self, state_template: State, input_state: State, supported_endpoints, role: Role
-    ) -> List[Relation]:
+        self, state_template: State, input_state: State, role: Role
+    ) -> Tuple[List[Relation], Relation]:
         """Merge the relations from the input state and the state template into one.
 
         The charm being tested possibly provided a state_template to define some setup mocking data
         The interface tests also have an input_state. Here we merge them into one relation list to
         be passed to the 'final' State the test will run with.
-        """
-        interface_name = self.ctx.interface_name
 
-        for rel in state_template.relations:
-            if rel.interface == interface_name:
-                logger.warning(
-                    "relation with interface name =%s found in state template. "
-                    "This will be overwritten by the relation spec provided by the relation "
-                    "interface test case." % interface_name
-                )
+        Returns the merged relation list and the relation (in that list) this test is about.
+        """
+        ctx = self.ctx
+        interface_name = ctx.interface_name
+
+        # partition the template relations in a single pass: those whose interface IS the
+        # interface we're testing, and those whose interface IS NOT.
+        tmpl_match, tmpl_other = [], []
+        for r in state_template.relations:
+            (tmpl_match if r.interface == interface_name else tmpl_other).append(r)
+
+        # the state template is the same for every run in this context: only warn once.
+        if tmpl_match and not ctx._warned_template_conflict:
+            logger.warning(
+                "relation with interface name =%s found in state template. "
+                "This will be overwritten by the relation spec provided by the relation "
+                "interface test case.",
+                interface_name,
+            )
+            ctx._warned_template_conflict = True
 
-        def filter_relations(rels: List[Relation], op: Callable):
-            return [r for r in rels if op(r.interface, interface_name)]
+        # same for the input relations: those that are about the interface we're testing
+        # and those that will be ignored.
+        input_match, input_ignored = [], []
+        for r in input_state.relations if input_state else ():
+            (input_match if r.interface == interface_name else input_ignored).append(r)
 
         # the baseline is: all relations whose interface IS NOT the interface we're testing.
-        relations = filter_relations(state_template.relations, op=operator.ne)
+        relations = tmpl_other
 
         if input_state:
             # if the charm we're testing specified some relations in its input state, we add those
             # whose interface IS the same as the one we're testing. If other relation interfaces
             # were specified, they will be ignored.
-            relations.extend(filter_relations(input_state.relations, op=operator.eq))
+            relations.extend(input_match)
 
-            if ignored := filter_relations(input_state.relations, op=operator.eq):
+            if input_ignored:
                 logger.warning(
                     "irrelevant relations specified in input state for %s/%s."
-                    "These will be ignored. details: %s" % (interface_name, role, ignored)
+                    "These will be ignored. details: %s",
+                    interface_name,
+                    role,
+                    input_ignored,
                 )
 
         # if we still don't have any relation matching the interface we're testing, we generate
         # one from scratch.
-        if not filter_relations(relations, op=operator.eq):
+        if not input_match:
             # if neither the charm nor the interface specified any custom relation spec for
             # the interface we're testing, we will provide one.
-            endpoints_for_interface = supported_endpoints[role]
-
-            if len(endpoints_for_interface) < 1:
-                raise ValueError(f"no endpoint found for {role}/{interface_name}.")
-            elif len(endpoints_for_interface) > 1:
-                raise ValueError(
-                    f"Multiple endpoints found for {role}/{interface_name}: "
-                    f"{endpoints_for_interface}: cannot guess which one it is "
-                    f"we're supposed to be testing"
-                )
-            else:
-                endpoint = endpoints_for_interface[0]
+            if ctx._endpoint_error:
+                raise ValueError(ctx._endpoint_error)
 
-            relations.append(
-                Relation(
-                    interface=interface_name,
-                    endpoint=endpoint,
-                )
+            tested_relation = Relation(
+                interface=interface_name,
+                endpoint=ctx._resolved_endpoint,
             )
+            relations.append(tested_relation)
+        else:
+            tested_relation = input_match[0]
+
         logger.debug(
-            "%s: merged %s and %s --> relations=%s"
-            % (self, input_state, state_template, relations)
+            "%s: merged %s and %s --> relations=%s",
+            self,
+            input_state,
+            state_template,
+            relations,
         )
-        return relations
+        return relations, tested_relation
@@ -35,6 +35,16 @@ def test_signature_checker_too_many_opt_params():
         check_test_case_validator_signature(_foo)
 
 
+def test_signature_checker_checks_once(caplog):
+    def _foo(a: int):
+        pass
+
+    check_test_case_validator_signature(_foo)
+    caplog.clear()
+    check_test_case_validator_signature(_foo)
+    assert not caplog.text
+
+
 def test_load_from_mock_cri():
     tests = collect_tests(CRI_LIKE_PATH)
     provider = tests["tracing"]["v42"]["provider"]
@@ -1,20 +1,21 @@
+import logging
 import tempfile
 from pathlib import Path
 from textwrap import dedent
 
 import pytest
 from ops import CharmBase
-from scenario import State
+from scenario import Context, State
 from utils import CRI_LIKE_PATH
 
-from interface_tester import InterfaceTester
+from interface_tester import InterfaceTester, interface_test
 from interface_tester.collector import gather_test_spec_for_version
 from interface_tester.errors import SchemaValidationError
 from interface_tester.interface_test import (
     InvalidTesterRunError,
     NoSchemaError,
     NoTesterInstanceError,
-    Tester,
+    _bound_tester,
 )
 
 
@@ -146,7 +147,7 @@ def test_data_on_changed():
 
     with pytest.raises(InvalidTesterRunError):
         tester.run()
-    assert not Tester.__instance__
+    assert not _bound_tester()
 
 
 def test_error_if_assert_schema_valid_before_run():
@@ -202,6 +203,120 @@ def test_data_on_changed():
         tester.run()
 
 
+def test_warn_on_irrelevant_input_relations(caplog):
+    tester = _setup_with_test_file(
+        dedent(
+            """
+from scenario import State, Relation
+
+from interface_tester.interface_test import Tester
+
+def test_data_on_changed():
+    t = Tester(State(
+        relations=[
+            Relation(
+                endpoint='tracing',
+                interface='tracing',
+                remote_app_name='remote',
+            ),
+            Relation(
+                endpoint='foo',
+                interface='foo',
+                remote_app_name='remote',
+            ),
+        ]
+    ))
+    state_out = t.run("tracing-relation-changed")
+    t.skip_schema_validation()
+"""
+        )
+    )
+
+    tester.run()
+    (warning,) = [
+        r.getMessage()
+        for r in caplog.records
+        if r.levelno == logging.WARNING and "irrelevant relations" in r.getMessage()
+    ]
+    assert "interface='foo'" in warning
+    assert "interface='tracing'" not in warning
+
+
+def test_consecutive_runs_do_not_share_context(monkeypatch):
+    contexts = []
+
+    class RecordingContext(Context):
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            contexts.append(self)
+
+    monkeypatch.setattr(interface_test, "Context", RecordingContext)
+    tester = _setup_with_test_file(
+        dedent(
+            """
+from scenario import State, Relation
+
+from interface_tester.interface_test import Tester
+
+def test_data_on_changed():
+    t = Tester(State(
+        relations=[Relation(
+            endpoint='tracing',
+            interface='tracing',
+            remote_app_name='remote',
+        )]
+    ))
+    t.run("tracing-relation-changed")
+    t.run("tracing-relation-changed")
+    t.skip_schema_validation()
+"""
+        )
+    )
+
+    tester.run()
+
+    first, second = contexts
+    assert first is not second
+    assert first.emitted_events
+    assert len(second.emitted_events) == len(first.emitted_events)
+    # the second run's context did not inherit the first run's juju-log lines
+    startup = [line for line in second.juju_log if "up and running" in line.message]
+    assert len(startup) == 1
+
+
+def _run_without_tested_relation(supported_endpoints):
+    def test_fn():
+        t = interface_test.Tester()
+        t.run("tracing-relation-changed")
+        t.skip_schema_validation()
+
+    ctx = interface_test._InterfaceTestContext(
+        interface_name="tracing",
+        version=42,
+        role="provider",
+        charm_type=DummiCharm,
+        supported_endpoints=supported_endpoints,
+        meta={"name": "dummi", "provides": {"tracing": {"interface": "tracing"}}},
+        config=None,
+        actions=None,
+        test_fn=test_fn,
+        state_template=None,
+    )
+    with interface_test.tester_context(ctx):
+        test_fn()
+
+
+def test_error_if_no_endpoint():
+    with pytest.raises(ValueError, match="no endpoint found for provider/tracing"):
+        _run_without_tested_relation({"provider": []})
+
+
+def test_error_if_multiple_endpoints():
+    supported_endpoints = {"provider": ["tracing", "tracing-2"]}
+    with pytest.raises(ValueError, match="Multiple endpoints found for provider/tracing"):
+        _run_without_tested_relation(supported_endpoints)
+
+
 def test_error_if_return_before_schema_call():
     tester = _setup_with_test_file(
         dedent(
@@ -387,6 +502,129 @@ def test_default_schema_validation_failure():
         tester.run()
 
 
+def test_schema_validation_failure_reports_one_error_per_relation():
+    tester = _setup_with_test_file(
+        dedent(
+            """
+ from scenario import State, Relation
+
+ from interface_tester.interface_test import Tester
+
+ def test_data_on_changed():
+     t = Tester(State(
+         relations=[
+             Relation(
+                 endpoint='tracing',
+                 interface='tracing',
+                 remote_app_name='remote',
+                 local_app_data={"bar": "1"},
+                 local_unit_data={"foo": "2"},
+             ),
+             Relation(
+                 endpoint='tracing',
+                 interface='tracing',
+                 remote_app_name='remote',
+             ),
+             Relation(
+                 endpoint='tracing',
+                 interface='tracing',
+                 remote_app_name='remote',
+                 local_app_data={"bar": "1"},
+                 local_unit_data={"foo": "abc"},
+             ),
+         ]
+     ))
+     state_out = t.run("tracing-relation-changed")
+     t.assert_schema_valid()
+ """
+        ),
+        schema_file=dedent(
+            """
+    from interface_tester.schema_base import DataBagSchema, BaseModel
+
+    class Foo(BaseModel):
+        foo: int
+    class Bar(BaseModel):
+        bar: int
+
+    class ProviderSchema(DataBagSchema):
+        unit: Foo
+        app: Bar
+    """
+        ),
+    )
+
+    with pytest.raises(SchemaValidationError) as e:
+        tester.run()
+
+    errors = e.value.args[0]
+    assert [(err["type"], err["loc"]) for err in errors] == [
+        ("missing", ("unit", "foo")),
+        ("int_parsing", ("unit", "foo")),
+    ]
+
+
+def test_empty_databags_skip_validation(caplog):
+    caplog.set_level(logging.DEBUG, logger="interface_tester.interface_test")
+    tester = _setup_with_test_file(
+        dedent(
+            """
+ from scenario import State, Relation
+
+ from interface_tester.interface_test import Tester
+ from interface_tester.schema_base import DataBagSchema
+
+ def test_data_on_changed():
+     t = Tester(State(
+         relations=[Relation(
+             endpoint='tracing',
+             interface='tracing',
+             remote_app_name='remote',
+         )]
+     ))
+     state_out = t.run("tracing-relation-changed")
+     t.assert_schema_valid(schema=DataBagSchema)
+ """
+        )
+    )
+
+    tester.run()
+    assert "all databags are empty and the schema allows it" in caplog.text
+
+
+def test_empty_databags_invalid_schema():
+    tester = _setup_with_test_file(
+        dedent(
+            """
+ from scenario import State, Relation
+
+ from interface_tester.interface_test import Tester
+ from interface_tester.schema_base import DataBagSchema, BaseModel
+
+ class Foo(BaseModel):
+    foo: int
+
+ class FooSchema(DataBagSchema):
+     app: Foo
+
+ def test_data_on_changed():
+     t = Tester(State(
+         relations=[Relation(
+             endpoint='tracing',
+             interface='tracing',
+             remote_app_name='remote',
+         )]
+     ))
+     state_out = t.run("tracing-relation-changed")
+     t.assert_schema_valid(schema=FooSchema)
+ """
+        )
+    )
+
+    with pytest.raises(SchemaValidationError):
+        tester.run()
+
+
 def test_valid_run_custom_schema():
     tester = _setup_with_test_file(
         dedent(